@@ -1,18 +1,27 @@
 # main.py
 
+import logging
+import os
 import sys
 import numpy as np
-import json
+import orjson
+import faiss
+import torch
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
 
 project_root = Path(__file__).resolve().parent
 src_dir = project_root / "src"
 sys.path.insert(0, str(src_dir))
 
 
-from sentence_transformers import SentenceTransformer, util
 from dz_scrap.database.db_manager import DBManager
+from dz_scrap.embedding.model_loader import load_embedding_model
+
+# Below this many vectors the in-memory index stays exact: the 8-bit quantizer
+# learns each dimension's value range from the vectors themselves, which too
+# small a corpus does not span (a constant dimension has no range at all)
+MIN_QUANTIZED_VECTORS = 4096
 
 # --- Initialization ---
 app = FastAPI(
@@ -30,22 +39,99 @@ def load_resources():
     
     app.state.db_manager = DBManager(db_path)
     
-    print("Loading embedding model...")
-    app.state.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+    # Pin the thread pools before any work runs: the cores are shared between
+    # the uvicorn workers (WEB_CONCURRENCY, which uvicorn reads for --workers),
+    # unless EMBEDDING_THREADS says otherwise, and a single inter-op thread
+    # suffices since requests encode one query at a time. The ONNX model gets
+    # the same settings from load_embedding_model.
+    worker_count = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+    num_threads = int(os.environ.get("EMBEDDING_THREADS", "0")) or max(1, (os.cpu_count() or 1) // worker_count)
+    torch.set_num_threads(num_threads)
+    # The inter-op pool can only be sized once per process, before it is first
+    # used: a second startup in the same process (e.g. another TestClient) keeps it
+    if torch.get_num_interop_threads() != 1:
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError as e:
+            logging.warning(f"Could not limit torch to a single inter-op thread: {e}")
+
+    print(f"Loading embedding model ({num_threads} threads)...")
+    app.state.model = load_embedding_model(num_threads=num_threads)
+    # A throwaway batch pays for kernel selection, thread spin-up and tokenizer
+    # setup here instead of on the first /search request
+    app.state.model.encode(["warmup"] * 8, convert_to_numpy=True)
     
+    chunk_count = app.state.db_manager.count_chunks()
+    app.state.chunk_count = chunk_count
+    if app.state.db_manager.vec_enabled and app.state.db_manager.count_vec_chunks() == chunk_count:
+        # Every chunk is in the sqlite-vec index: searches run inside SQLite
+        # and nothing needs to be loaded into memory.
+        app.state.index = None
+        print(f"Startup complete. Searching {chunk_count} vectors with sqlite-vec.")
+        return
+
     print("Loading vectors from database into memory...")
     cursor = app.state.db_manager.conn.cursor()
-    cursor.execute("SELECT id, embedding, chunk_text, metadata FROM chunks")
     
+    # Keep the embeddings apart from the per-chunk records: the index owns
+    # the (N, dim) matrix, app.state.vectors only the text and metadata,
+    # with row i of one matching entry i of the other.
+    # Rows are streamed from the cursor straight into a preallocated matrix
+    # (the LIMIT guards against chunks ingested after the count).
+    dim = app.state.model.get_sentence_embedding_dimension()
+    embedding_matrix = np.empty((chunk_count, dim), dtype=np.float32)
     vectors = []
-    for row in cursor.fetchall():
+    # Chunks of the same legal document only differ by their article number, so
+    # the rest of their metadata is kept once and shared. Rows come grouped by
+    # source file, which keeps this lookup table small.
+    shared_metadata = {}
+    current_document_id = None
+    cursor.execute(
+        # Chunks ingested with sqlite-vec keep their embedding only in its index,
+        # which needs the extension to be searched
+        "SELECT id, embedding, chunk_text, metadata, document_id FROM chunks "
+        "WHERE embedding IS NOT NULL ORDER BY document_id, id LIMIT ?",
+        (chunk_count,)
+    )
+    for i, row in enumerate(cursor):
+        if row[4] != current_document_id:
+            current_document_id = row[4]
+            shared_metadata.clear()
+        metadata = orjson.loads(row[3])
+        article_number = metadata.pop("source_article_number", None)
+
+        # Embeddings are stored as float16; databases ingested before that hold float32
+        dtype = np.float16 if len(row[1]) == 2 * dim else np.float32
+        # Upcast to the float32 layout FAISS works on
+        embedding_matrix[i] = np.frombuffer(row[1], dtype=dtype)
         vectors.append({
             "id": row[0],
-            "embedding": np.frombuffer(row[1], dtype=np.float32),
             "text": row[2],
-            "metadata": json.loads(row[3])
+            "metadata": shared_metadata.setdefault(tuple(metadata.items()), metadata),
+            "article_number": article_number
         })
+    embedding_matrix = embedding_matrix[:len(vectors)]
     app.state.vectors = vectors
+
+    print("Building similarity index...")
+    # Embeddings are L2-normalized so that inner product equals cosine similarity,
+    # then, for large enough corpora, stored as 8-bit codes (one byte per
+    # dimension instead of four).
+    if len(vectors) >= MIN_QUANTIZED_VECTORS:
+        index = faiss.IndexScalarQuantizer(
+            dim,
+            faiss.ScalarQuantizer.QT_8bit,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+    else:
+        index = faiss.IndexFlatIP(dim)
+    if vectors:
+        faiss.normalize_L2(embedding_matrix)
+        # Learns the per-dimension value range used to quantize the vectors
+        # (a no-op for the exact index)
+        index.train(embedding_matrix)
+        index.add(embedding_matrix)
+    app.state.index = index
     print(f"Startup complete. Loaded {len(vectors)} vectors.")
 
 # --- API Endpoints ---
@@ -54,37 +140,46 @@ def read_root():
     return {"message": "Welcome to the DropZone Law Search API"}
 
 @app.get("/search", tags=["Search"])
-def search_documents(q: str, top_k: int = 5):
+def search_documents(q: str, top_k: int = Query(5, ge=1)):
     """
     Search for relevant text chunks using a natural language query.
     """
     if not hasattr(app.state, 'model'):
         raise HTTPException(status_code=503, detail="API is not ready, resources are loading.")
         
-    query_embedding = app.state.model.encode(q)
+    # Stored vectors were normalized once at startup; asking the model for a
+    # unit-length query makes each search a plain inner product against them.
+    query_embedding = app.state.model.encode([q], convert_to_numpy=True, normalize_embeddings=True)
+    
+    # Never ask for more neighbours than the index holds: FAISS would pad the
+    # result with -1 entries and still pay for a k-sized selection heap.
+    k = min(top_k, app.state.chunk_count if app.state.index is None else app.state.index.ntotal)
+    if k == 0:
+        return {"query": q, "results": []}
     
-    # Calculate cosine similarity with imported 'util'
-    all_embeddings = np.array([v['embedding'] for v in app.state.vectors])
-    similarities = util.cos_sim(query_embedding, all_embeddings)[0]
+    if app.state.index is None:
+        # sqlite-vec returns cosine distances, closest first
+        results = []
+        for text, metadata, distance in app.state.db_manager.search_chunks(query_embedding[0], k):
+            results.append({
+                "score": 1.0 - distance,
+                "text": text,
+                "metadata": orjson.loads(metadata)
+            })
+        return {"query": q, "results": results}
     
-    # argsort() returns the indices that would sort the array.
-    # Slicing with [-top_k:] gets the indices of the top K highest scores.
-    top_k_indices = np.argsort(similarities)[-top_k:]
-    # Reverse the list to get the highest score first
-    top_k_indices = reversed(top_k_indices)
+    # The index keeps only the top K candidates while scanning and returns
+    # them already sorted, highest score first.
+    scores, indices = app.state.index.search(query_embedding, k)
     
     results = []
-    # top_results is a list of tuples (score, index)
-    for idx in top_k_indices:
-        # Get the original vector info using the index
+    for score, idx in zip(scores[0], indices[0]):
         vector_info = app.state.vectors[idx]
-        # Get the similarity score for that index
-        score = similarities[idx]
         
         results.append({
             "score": float(score),
             "text": vector_info['text'],
-            "metadata": vector_info['metadata']
+            "metadata": {**vector_info['metadata'], "source_article_number": vector_info['article_number']}
         })
         
     return {"query": q, "results": results}
@@ -101,4 +196,6 @@ def get_document(file_name: str):
     if not result:
         raise HTTPException(status_code=404, detail="Document not found")
         
-    return json.loads(result[0])
+    # The document is stored as JSON text already: send it as is rather than
+    # parsing it only for FastAPI to serialize it again
+    return Response(content=result[0], media_type="application/json")
@@ -1,14 +1,40 @@
 # src/dz_scrap/database/db_manager.py
+import logging
 import sqlite3
-import json
+import numpy as np
+import orjson
+import sqlite_vec
 from pathlib import Path
+from typing import Iterable
 
 class DBManager:
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, embedding_dim: int = 384):
         self.db_path = db_path
+        self.embedding_dim = embedding_dim
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # WAL lets readers run alongside a writer, and NORMAL only syncs at
+        # checkpoints instead of on every commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.vec_enabled = self._load_vec_extension()
         self.create_tables()
+        if self.vec_enabled:
+            self._backfill_vec_chunks()
+
+    def _load_vec_extension(self) -> bool:
+        """
+        Loads the sqlite-vec extension, which provides the vec0 vector search table.
+        Some Python builds (e.g. the macOS system Python) cannot load SQLite extensions.
+        """
+        try:
+            self.conn.enable_load_extension(True)
+            sqlite_vec.load(self.conn)
+            self.conn.enable_load_extension(False)
+            return True
+        except (AttributeError, sqlite3.OperationalError) as e:
+            logging.warning(f"sqlite-vec could not be loaded, vector search will run in memory: {e}")
+            return False
 
     def create_tables(self):
         cursor = self.conn.cursor()
@@ -30,7 +56,54 @@ class DBManager:
             metadata TEXT,
             FOREIGN KEY (document_id) REFERENCES documents (id)
         )""")
+        # Index the foreign key used to look up a document's chunks.
+        # documents.file_name needs none: its UNIQUE constraint is backed by an index.
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks (document_id)")
+        # Vector index over the chunk embeddings, searched in SQLite itself. It is
+        # their only copy: each is quantized to int8, a quarter of its float32 size.
+        if self.vec_enabled:
+            # An index created before the embeddings moved into it holds float32
+            # copies; it is rebuilt from the chunks table by _backfill_vec_chunks
+            row = cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'vec_chunks'").fetchone()
+            if row and "int8[" not in row[0]:
+                cursor.execute("DROP TABLE vec_chunks")
+            cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS vec_chunks USING vec0(
+                chunk_id INTEGER PRIMARY KEY,
+                embedding int8[{self.embedding_dim}] distance_metric=cosine
+            )""")
         self.conn.commit()
+
+    def _backfill_vec_chunks(self):
+        """
+        Moves the embeddings still held in the chunks table, by databases ingested
+        without sqlite-vec or before the vec_chunks index, into the index.
+        """
+        if not self.conn.execute("SELECT 1 FROM chunks WHERE embedding IS NOT NULL LIMIT 1").fetchone():
+            return
+        logging.info("Moving chunk embeddings into the vec_chunks index...")
+        with self.conn:
+            # vec_quantize_int8 reads float32; upcast the float16 embeddings first
+            float16_rows = self.conn.execute(
+                "SELECT id, embedding FROM chunks WHERE length(embedding) = ?", (2 * self.embedding_dim,)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE chunks SET embedding = ? WHERE id = ?",
+                ((np.frombuffer(embedding, dtype=np.float16).astype(np.float32).tobytes(), chunk_id)
+                 for chunk_id, embedding in float16_rows)
+            )
+            self._move_embeddings_to_vec()
+
+    def _move_embeddings_to_vec(self):
+        """
+        Quantizes the float32 embeddings of the chunks table into vec_chunks in
+        one statement, then clears them. Runs inside the caller's transaction.
+        """
+        self.conn.execute("""
+        INSERT OR REPLACE INTO vec_chunks (chunk_id, embedding)
+        SELECT id, vec_quantize_int8(embedding, 'unit') FROM chunks WHERE embedding IS NOT NULL
+        """)
+        self.conn.execute("UPDATE chunks SET embedding = NULL WHERE embedding IS NOT NULL")
     
     def get_document_by_filename(self, file_name: str) -> int | None:
         cursor = self.conn.cursor()
@@ -42,15 +115,57 @@ class DBManager:
         cursor = self.conn.cursor()
         cursor.execute(
             "INSERT INTO documents (file_name, category, data) VALUES (?, ?, ?)",
-            (file_name, category, json.dumps(data, ensure_ascii=False))
+            (file_name, category, orjson.dumps(data).decode())
         )
         self.conn.commit()
         return cursor.lastrowid
         
-    def insert_chunk(self, doc_id: int, text: str, embedding: bytes, metadata: dict):
+    def insert_chunk(self, doc_id: int, text: str, embedding: np.ndarray, metadata: dict):
+        self.insert_chunks([(doc_id, text, embedding, metadata)])
+
+    def insert_chunks(self, chunks: Iterable[tuple[int, str, np.ndarray, dict]]):
+        """
+        Inserts (doc_id, text, embedding, metadata) rows in a single transaction.
+
+        With sqlite-vec, the embeddings are staged in the chunks table as float32,
+        then moved into the vec_chunks index as int8. Without it, they stay in
+        the chunks table as float16, which is plenty for cosine similarity.
+        """
+        dtype = np.float32 if self.vec_enabled else np.float16
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO chunks (document_id, chunk_text, embedding, metadata) VALUES (?, ?, ?, ?)",
+                (
+                    (doc_id, text, embedding.astype(dtype).tobytes(), orjson.dumps(metadata).decode())
+                    for doc_id, text, embedding, metadata in chunks
+                )
+            )
+            if self.vec_enabled:
+                self._move_embeddings_to_vec()
+
+    def count_chunks(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def count_vec_chunks(self) -> int:
+        if not self.vec_enabled:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM vec_chunks").fetchone()[0]
+
+    def search_chunks(self, embedding: np.ndarray, k: int) -> list[tuple[str, str, float]]:
+        """
+        Finds the k chunks closest to an embedding with the vec_chunks index.
+
+        Returns:
+            list[tuple[str, str, float]]: (chunk_text, metadata, cosine distance) rows, closest first.
+        """
         cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO chunks (document_id, chunk_text, embedding, metadata) VALUES (?, ?, ?, ?)",
-            (doc_id, text, embedding, json.dumps(metadata, ensure_ascii=False))
+        cursor.execute("""
+        WITH matches AS (
+            SELECT chunk_id, distance FROM vec_chunks
+            WHERE embedding MATCH vec_quantize_int8(?, 'unit') AND k = ?
         )
-        self.conn.commit()
+        SELECT chunks.chunk_text, chunks.metadata, matches.distance
+        FROM matches JOIN chunks ON chunks.id = matches.chunk_id
+        ORDER BY matches.distance
+        """, (embedding.astype(np.float32).tobytes(), k))
+        return cursor.fetchall()
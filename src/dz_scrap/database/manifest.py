@@ -0,0 +1,65 @@
+# src/dz_scrap/database/manifest.py
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable
+
+# How far each file has made it through the pipeline
+STAGE_PENDING = 0
+STAGE_OCR_DONE = 1
+STAGE_PARSED = 2
+STAGE_CHUNKED = 3
+
+class PipelineManifest:
+    """
+    Records the progress of every PDF through the processing pipeline, so that
+    a resumed run can pick its work from one query instead of checking outputs.
+    """
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+    def create_tables(self):
+        # compressed records whether the file's outputs were written as *.zst
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            stage INTEGER NOT NULL DEFAULT 0,
+            compressed INTEGER,
+            updated_at REAL
+        )""")
+        # Manifests created before the column was added leave it NULL: unknown
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(files)")]
+        if "compressed" not in columns:
+            self.conn.execute("ALTER TABLE files ADD COLUMN compressed INTEGER")
+        self.conn.commit()
+
+    def get_stages(self, paths: Iterable[str], compressed: bool = False) -> dict[str, int]:
+        """
+        Registers any new paths as pending and returns the stage of every path.
+
+        A path whose outputs were written in the other form (compressed or not),
+        or in an unknown one, is pending again: the next stage would not find them.
+        """
+        paths = list(paths)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO files (path, stage, compressed, updated_at) VALUES (?, ?, ?, ?)",
+                ((path, STAGE_PENDING, compressed, time.time()) for path in paths)
+            )
+        rows = {path: (stage, form) for path, stage, form in self.conn.execute("SELECT path, stage, compressed FROM files")}
+        return {
+            path: stage if form == compressed else STAGE_PENDING
+            for path, (stage, form) in ((path, rows[path]) for path in paths)
+        }
+
+    def set_stage(self, path: str, stage: int, compressed: bool = False):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE files SET stage = ?, compressed = ?, updated_at = ? WHERE path = ?",
+                (stage, compressed, time.time(), path)
+            )
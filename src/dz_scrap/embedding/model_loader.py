@@ -0,0 +1,78 @@
+# src/dz_scrap/embedding/model_loader.py
+
+import logging
+import os
+from pathlib import Path
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+# Where the exported int8 ONNX model lives, e.g. <project_root>/models/mini-int8
+DEFAULT_MODEL_DIR = Path(__file__).resolve().parents[3] / "models" / "mini-int8"
+
+# The instruction set the int8 kernels are tuned for. "avx2" runs on any modern
+# x86 CPU; "avx512_vnni" is faster where supported, "arm64" targets ARM.
+DEFAULT_QUANTIZATION = "avx2"
+
+
+def _quantized_file_name(quantization_config: str) -> str:
+    """Returns the ONNX file name written by the export for a given config."""
+    return f"onnx/model_qint8_{quantization_config}.onnx"
+
+
+def export_quantized_model(model_dir: Path = DEFAULT_MODEL_DIR, quantization_config: str = DEFAULT_QUANTIZATION) -> Path:
+    """
+    Exports the embedding model to ONNX and writes a dynamically int8-quantized copy.
+
+    Args:
+        model_dir (Path): The directory to save the exported model into.
+        quantization_config (str): The target instruction set ("arm64", "avx2",
+                                   "avx512" or "avx512_vnni").
+
+    Returns:
+        Path: The path to the quantized ONNX file.
+    """
+    model_dir.mkdir(parents=True, exist_ok=True)
+    logging.info(f"Exporting {MODEL_NAME} to ONNX in {model_dir}...")
+    model = SentenceTransformer(MODEL_NAME, backend="onnx")
+    model.save(str(model_dir))
+
+    logging.info(f"Quantizing the ONNX model to int8 ({quantization_config})...")
+    export_dynamic_quantized_onnx_model(model, quantization_config, str(model_dir))
+    return model_dir / _quantized_file_name(quantization_config)
+
+
+def load_embedding_model(model_dir: Path = DEFAULT_MODEL_DIR, quantization_config: str = DEFAULT_QUANTIZATION,
+                         num_threads: int | None = None) -> SentenceTransformer:
+    """
+    Loads the int8 ONNX embedding model, falling back to the PyTorch model
+    if it has not been exported yet (see tools/export_onnx_model.py).
+
+    Args:
+        model_dir (Path): The directory the quantized model was exported to.
+        quantization_config (str): The config the model was quantized with.
+        num_threads (int | None): The number of threads ONNX Runtime runs each
+                                  encode on. Defaults to the CPU count.
+
+    Returns:
+        SentenceTransformer: The loaded embedding model.
+    """
+    file_name = _quantized_file_name(quantization_config)
+    if (model_dir / file_name).exists():
+        logging.info(f"Loading quantized ONNX model from {model_dir / file_name}")
+        import onnxruntime
+        # torch's thread settings don't reach ONNX Runtime, which has its own pools:
+        # intra-op parallelism on every core, a single inter-op thread
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = num_threads or os.cpu_count() or 1
+        session_options.inter_op_num_threads = 1
+        return SentenceTransformer(
+            str(model_dir), backend="onnx",
+            model_kwargs={"file_name": file_name, "session_options": session_options},
+        )
+
+    logging.warning(f"No quantized model found in {model_dir}. Falling back to the PyTorch model {MODEL_NAME}.")
+    return SentenceTransformer(MODEL_NAME)
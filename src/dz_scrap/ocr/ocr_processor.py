@@ -1,30 +1,105 @@
 # src/dz_scrap/ocr/ocr_processor.py
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+import pymupdf
 import pytesseract
-from pdf2image import convert_from_path
 from PIL import Image
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# A page whose embedded text layer has at least this many characters is read
+# directly; pages below it (typically scanned images) are sent to Tesseract.
+MIN_TEXT_LAYER_CHARS = 200
+
+# Pages are rasterized at this resolution for OCR; printed gazette text needs
+# no more, and low-quality scans can be dialled back up
+DEFAULT_OCR_DPI = 200
+
+# Inserted between the texts of consecutive pages
+PAGE_SEPARATOR = "\n\n--- NEW PAGE ---\n\n"
+
+def _ocr_page(page_num: int, pdf_path: Path, language: str, page_count: int,
+              dpi: int = DEFAULT_OCR_DPI, max_image_dim: int | None = None) -> str:
+    """
+    Converts a single PDF page to an image and extracts its text with Tesseract.
+
+    Defined at module level so it can be sent to worker processes. Each worker
+    rasterizes its own page instead of receiving a large pickled image.
+    """
+    logging.info(f"Processing page {page_num}/{page_count} of {pdf_path.name}...")
+    # Tesseract binarizes its input anyway: an 8-bit grayscale page is a third
+    # of the size of an RGB one and reads the same
+    with pymupdf.open(pdf_path) as document:
+        pixmap = document[page_num - 1].get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY)
+    image = Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+    del pixmap
+    if max_image_dim and max(image.size) > max_image_dim:
+        image.thumbnail((max_image_dim, max_image_dim), Image.Resampling.LANCZOS)
+    try:
+        # Use Tesseract to do OCR on the image
+        # We specify the languages to look for
+        return pytesseract.image_to_string(image, lang=language)
+    except pytesseract.TesseractError as e:
+        logging.error(f"Tesseract error on page {page_num} of {pdf_path.name}: {e}")
+        return f"\n--- TESSERACT ERROR ON PAGE {page_num} ---\n"
+
 class OcrProcessor:
     """
     Handles the OCR process for a single PDF file.
-    Converts PDF pages to images and uses Tesseract to extract text.
+    Reads the embedded text layer of each page, and converts the pages without
+    one to images and uses Tesseract to extract their text.
     """
-    def __init__(self, language: str = 'fra+ara'):
+    def __init__(self, language: str = 'fra+ara', max_workers: int | None = None,
+                 dpi: int = DEFAULT_OCR_DPI, max_image_dim: int | None = None):
         """
         Initializes the OCR processor.
 
         Args:
             language (str): The language string for Tesseract (e.g., 'fra' for French,
                             'ara' for Arabic, 'fra+ara' for both).
+            max_workers (int | None): The number of processes used to OCR the pages
+                                      of a PDF in parallel. Defaults to the CPU count;
+                                      use 1 when already running inside a worker pool.
+            dpi (int): The resolution pages are rasterized at for OCR.
+            max_image_dim (int | None): If set, page images are downsized so that
+                                        their longest side is at most this many pixels.
         """
         self.language = language
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.max_image_dim = max_image_dim
         logging.info(f"OCR Processor initialized for languages: {self.language}")
 
+    def read_text_layer(self, pdf_path: Path) -> list[str | None]:
+        """
+        Reads the embedded text layer of every page of a PDF.
+
+        Args:
+            pdf_path (Path): The path to the PDF file.
+
+        Returns:
+            list[str | None]: The text of each page, or None for the pages
+                              without a usable text layer, which need OCR.
+        """
+        # The PDF is opened by path rather than loaded: MuPDF reads only the
+        # parts of the file it needs.
+        with pymupdf.open(pdf_path) as document:
+            page_texts = [page.get_text("text") for page in document]
+        return [text if len(text.strip()) >= MIN_TEXT_LAYER_CHARS else None for text in page_texts]
+
+    def ocr_page(self, pdf_path: Path, page_num: int, page_count: int) -> str:
+        """Rasterizes a single page of a PDF and extracts its text with Tesseract."""
+        return _ocr_page(page_num, pdf_path, self.language, page_count, self.dpi, self.max_image_dim)
+
+    def join_pages(self, page_texts: list[str]) -> str:
+        """Concatenates the texts of a PDF's pages into the text of the document."""
+        return PAGE_SEPARATOR.join(page_texts)
+
     def process_pdf(self, pdf_path: Path) -> str:
         """
         Performs OCR on an entire PDF file and returns the extracted text.
@@ -40,27 +115,30 @@ class OcrProcessor:
             return ""
 
         logging.info(f"Starting OCR process for: {pdf_path.name}")
-        full_text = []
-
         try:
-            # Convert PDF to a list of PIL images
-            # dpi=300 is a good balance of quality and processing time
-            images = convert_from_path(pdf_path, dpi=300)
-
-            for i, image in enumerate(images):
-                page_num = i + 1
-                logging.info(f"Processing page {page_num}/{len(images)} of {pdf_path.name}...")
-                try:
-                    # Use Tesseract to do OCR on the image
-                    # We specify the languages to look for
-                    text = pytesseract.image_to_string(image, lang=self.language)
-                    full_text.append(text)
-                except pytesseract.TesseractError as e:
-                    logging.error(f"Tesseract error on page {page_num} of {pdf_path.name}: {e}")
-                    full_text.append(f"\n--- TESSERACT ERROR ON PAGE {page_num} ---\n")
+            # Reading an embedded text layer is far faster than OCR and lossless,
+            # so only the pages without one are rasterized for Tesseract
+            full_text = self.read_text_layer(pdf_path)
+            page_count = len(full_text)
+            page_numbers = [page_num for page_num, text in enumerate(full_text, start=1) if text is None]
+            logging.info(f"{page_count - len(page_numbers)}/{page_count} pages of {pdf_path.name} have a text layer.")
+            ocr_page = partial(
+                _ocr_page, pdf_path=pdf_path, language=self.language, page_count=page_count,
+                dpi=self.dpi, max_image_dim=self.max_image_dim,
+            )
+
+            # Pages are independent, so they are spread across processes;
+            # map() returns them in page order.
+            if self.max_workers == 1 or len(page_numbers) <= 1:
+                ocr_text = [ocr_page(page_num) for page_num in page_numbers]
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(page_numbers))) as executor:
+                    ocr_text = list(executor.map(ocr_page, page_numbers))
+            for page_num, text in zip(page_numbers, ocr_text):
+                full_text[page_num - 1] = text
 
             logging.info(f"Successfully finished OCR for: {pdf_path.name}")
-            return "\n\n--- NEW PAGE ---\n\n".join(full_text)
+            return self.join_pages(full_text)
 
         except Exception as e:
             logging.error(f"An unexpected error occurred while processing {pdf_path}: {e}")
@@ -1,70 +1,186 @@
 # src/dz_scrap/parsing/parser.py
 
 import logging
-import re
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Import our custom patterns
 from dz_scrap.parsing.patterns import (
     DOCUMENT_START_PATTERN,
-    DOCUMENT_HEADER_PATTERN,
-    ARTICLE_PATTERN,
+    HEADER_PREFIX_PATTERN,
+    HEADER_DATE_PATTERN,
+    HEADER_END_PATTERN,
+    ARTICLE_START_PATTERN,
+    ARTICLE_END_PATTERN,
     INDIVIDUAL_DECISION_PATTERN,
+    PAGE_ARTIFACT_PATTERN,
+    WHITESPACE_PATTERN,
+    SOMMAIRE_PATTERN,
 )
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# How far past the header prefix the date and action verb are looked for
+HEADER_WINDOW = 2048
+
+def _parse_segment(segment_num: int, doc_text: str) -> Optional[Dict]:
+    """
+    Parses one document segment. Defined at module level so it can be sent
+    to worker processes.
+    """
+    logging.info(f"--- Parsing potential document segment #{segment_num} ---")
+    return LegalParser(max_workers=1).parse_document(doc_text)
+
+def _iter_articles(text: str, pos: int = 0, endpos: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Yields the (number, content) of each article in text[pos:endpos], in a single
+    pass over its lines.
+
+    An article starts on a line beginning with "Art." or "Article." followed by
+    its number, and runs until the next line that starts another article or a
+    closing statement (see ARTICLE_END_PATTERN). Like the line breaks before them,
+    articles must start after the first line of text.
+
+    Lines are located with str.find and matched with pos/endpos bounds on the
+    original string: only each article's content is sliced out.
+    """
+    if endpos is None:
+        endpos = len(text)
+    number = None
+    content_start = content_end = 0
+    # Each line starts after a line break, which is why the first line is skipped
+    line_break = text.find('\n', pos, endpos)
+    while line_break != -1:
+        line_start = line_break + 1
+        line_break = text.find('\n', line_start, endpos)
+        line_end = endpos if line_break == -1 else line_break
+        if ARTICLE_END_PATTERN.match(text, line_start, line_end):
+            if number is not None:
+                yield number, text[content_start:content_end]
+                number = None
+            start_match = ARTICLE_START_PATTERN.match(text, line_start, line_end)
+            if start_match:
+                number = start_match.group("number")
+                content_start = start_match.end()
+        content_end = line_end
+    if number is not None:
+        yield number, text[content_start:content_end]
+
 class LegalParser:
     """
     Parses raw text from the Algerian Official Gazette into structured data.
     """
+    # Bump whenever a change alters the parsed output, to invalidate cached results
+    VERSION = "1"
+
+    def __init__(self, max_workers: int = 1):
+        """
+        Initializes the parser.
+
+        Args:
+            max_workers (int): The number of processes used to parse the documents
+                               of a gazette in parallel. Defaults to 1, parsing
+                               in-process; larger values start a process pool for
+                               each gazette, which only pays off on large ones.
+        """
+        self.max_workers = max_workers
+
     def _pre_clean_gazette(self, text: str) -> str:
         """Removes page-level artifacts before any other processing."""
-        text = re.sub(r'--- NEW PAGE ---', '', text)
-        text = re.sub(r'\n\s*9 Joumada Ethania 1446\n.*', '', text)
-        text = re.sub(r'\n\s*JOURNAL OFFICIEL DE LA REPUBLIQUE ALGERIENNE N° \d+', '', text)
-        return text
+        return PAGE_ARTIFACT_PATTERN.sub('', text)
 
     def _clean_field(self, text: str) -> str:
         """Performs final cleaning on an extracted field."""
-        text = text.replace('\n', ' ').strip()
-        text = re.sub(r'\s+', ' ', text)
+        # Newlines are whitespace too, so one pass collapses them as well
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         return text.lstrip('.- ').strip()
 
-    def _find_content_start(self, text: str) -> str:
-        """Finds the start of the main content after the SOMMAIRE."""
+    def _find_content_start(self, text: str) -> int:
+        """Finds the offset where the main content starts, after the SOMMAIRE."""
         # We start parsing from "DECISIONS" or the first major heading after the table of contents
-        parts = re.split(r'SOMMAIRE(?: \(suite\))?', text, maxsplit=1, flags=re.IGNORECASE)
-        if len(parts) > 1:
-            return parts[1]
+        match = SOMMAIRE_PATTERN.search(text)
+        if match:
+            return match.end()
         logging.warning("SOMMAIRE section not found. Attempting to parse from beginning.")
-        return text
+        return 0
+
+    def _match_header(self, text: str, start: int, end: int) -> Optional[Tuple[Dict[str, str], int]]:
+        """
+        Finds the first document header in text[start:end].
+
+        Candidates are located with the anchored prefix pattern; the date and
+        the end of the title are then scanned forward from each one with their
+        own patterns, the date within a bounded window.
+
+        Returns:
+            The header fields (type, number, date, title) and the offset where
+            the header ends, or None if there is no header.
+        """
+        pos = start
+        while True:
+            prefix_match = HEADER_PREFIX_PATTERN.search(text, pos, end)
+            if not prefix_match:
+                return None
+            pos = prefix_match.start() + 1
+
+            window_end = min(end, prefix_match.end() + HEADER_WINDOW)
+            date_match = HEADER_DATE_PATTERN.match(text, prefix_match.end(), window_end)
+            if not date_match:
+                continue
+
+            # The title normally starts after the whitespace following the verb.
+            # Failing that, the preamble may directly follow the verb (empty title),
+            # its leading newline being the last one in that whitespace.
+            title_start = date_match.end()
+            end_match = HEADER_END_PATTERN.search(text, title_start, end)
+            if not end_match:
+                title_start = text.rfind('\n', date_match.end("verb") + 1, date_match.end())
+                if title_start == -1:
+                    continue
+                end_match = HEADER_END_PATTERN.match(text, title_start, end)
+            if not end_match:
+                continue
 
-    def parse_articles(self, text: str) -> List[Dict[str, str]]:
-        """Finds and parses all articles in a given text block."""
+            header_data = {
+                **prefix_match.groupdict(),
+                "date": date_match.group("date"),
+                "title": text[title_start:end_match.start()],
+            }
+            return header_data, end_match.start()
+
+    def parse_articles(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> List[Dict[str, str]]:
+        """Finds and parses all articles in text[pos:endpos]."""
         articles = []
-        for match in ARTICLE_PATTERN.finditer(text):
-            data = match.groupdict()
+        # The content keeps the line breaks between its lines: _clean_field
+        # collapses them along with the rest of the whitespace
+        for number, content in _iter_articles(text, pos, endpos):
             articles.append({
-                "number": self._clean_field(data.get("number", "")),
-                "content": self._clean_field(data.get("content", ""))
+                "number": self._clean_field(number),
+                "content": self._clean_field(content)
             })
         return articles
 
-    def parse_document(self, doc_text: str) -> Optional[Dict]:
+    def parse_document(self, text: str, start: int = 0, end: Optional[int] = None) -> Optional[Dict]:
         """
         Parses a single legal document's text to extract its metadata and articles.
+
+        The document is text[start:end]; the patterns are run with pos/endpos
+        bounds on the original string, so only the extracted fields are copied.
         """
-        header_match = DOCUMENT_HEADER_PATTERN.search(doc_text)
+        if end is None:
+            end = len(text)
+        header = self._match_header(text, start, end)
         is_individual = False
-        if not header_match:
-            header_match = INDIVIDUAL_DECISION_PATTERN.search(doc_text)
+        if not header:
+            individual_match = INDIVIDUAL_DECISION_PATTERN.search(text, start, end)
+            if individual_match:
+                header = individual_match.groupdict(), individual_match.end()
             is_individual = True
 
-        if not header_match:
+        if not header:
             return None
 
-        header_data = header_match.groupdict()
+        header_data, header_end = header
         
         document_type = self._clean_field(header_data.get("type", "N/A"))
         official_number = self._clean_field(header_data.get("number", "N/A"))
@@ -80,8 +196,7 @@ class LegalParser:
             # and pass the remainder of the text to the article parser.
             # This was the original logic, but it needed the header pattern to be correct.
             # Now that the header pattern correctly stops before "Article 1", this works.
-            article_text_block = doc_text[header_match.end():]
-            articles = self.parse_articles(article_text_block)
+            articles = self.parse_articles(text, header_end, end)
 
         # Final validation
         if title == "N/A" and not articles:
@@ -101,22 +216,28 @@ class LegalParser:
         legal documents and parsing each one.
         """
         cleaned_gazette_text = self._pre_clean_gazette(full_text)
-        main_content = self._find_content_start(cleaned_gazette_text)
+        content_start = self._find_content_start(cleaned_gazette_text)
         
-        starts = [match.start() for match in DOCUMENT_START_PATTERN.finditer(main_content)]
+        # Each document runs from its start to the next one's (or the end of the text).
+        # Segments are kept as offsets into the cleaned text rather than sliced out.
+        starts = [match.start() for match in DOCUMENT_START_PATTERN.finditer(cleaned_gazette_text, content_start)]
         if not starts:
             return []
+        ends = starts[1:] + [len(cleaned_gazette_text)]
 
-        doc_texts = []
-        for i in range(len(starts)):
-            start_pos = starts[i]
-            end_pos = starts[i+1] if i + 1 < len(starts) else len(main_content)
-            doc_texts.append(main_content[start_pos:end_pos])
+        if self.max_workers == 1 or len(starts) == 1:
+            results = []
+            for i, (start_pos, end_pos) in enumerate(zip(starts, ends)):
+                logging.info(f"--- Parsing potential document segment #{i+1} ---")
+                results.append(self.parse_document(cleaned_gazette_text, start_pos, end_pos))
+        else:
+            # Segments are independent; each worker only receives its own slice
+            segments = (cleaned_gazette_text[start_pos:end_pos] for start_pos, end_pos in zip(starts, ends))
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(starts))) as executor:
+                results = list(executor.map(_parse_segment, range(1, len(starts) + 1), segments, chunksize=8))
 
         parsed_documents = []
-        for i, doc_text in enumerate(doc_texts):
-            logging.info(f"--- Parsing potential document segment #{i+1} ---")
-            parsed_doc = self.parse_document(doc_text)
+        for parsed_doc in results:
             if parsed_doc:
                 # Filter out low-quality results that are just titles without articles
                 if parsed_doc["official_number"] == "N/A" and not parsed_doc["articles"]:
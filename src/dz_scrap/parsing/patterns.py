@@ -2,31 +2,65 @@
 
 import re
 
+# Page-level artifacts left by the OCR step (page separators, running headers),
+# fused into a single alternation so the whole gazette is scanned only once.
+PAGE_ARTIFACT_PATTERN = re.compile(
+    r'--- NEW PAGE ---'
+    r'|\n\s*+9 Joumada Ethania 1446\n.*'
+    r'|\n\s*+JOURNAL OFFICIEL DE LA REPUBLIQUE ALGERIENNE N° \d+'
+)
+
+# Runs of whitespace, collapsed to a single space when cleaning fields.
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# The table of contents heading; the main content starts after it.
+SOMMAIRE_PATTERN = re.compile(r'SOMMAIRE(?: \(suite\))?', re.IGNORECASE)
+
 # A robust pattern to find the start of any major legal act.
 DOCUMENT_START_PATTERN = re.compile(
     r'^(?:Décret|Loi|Arrêté|Décision)\s',
     re.IGNORECASE | re.MULTILINE
 )
 
-# This pattern captures the main header of a single legal document.
-# It's designed to handle multi-line titles and variations in spacing.
-DOCUMENT_HEADER_PATTERN = re.compile(
+# The main header of a legal document is matched in stages, each with a small
+# pattern run from where the previous one stopped, instead of one pattern with
+# several non-greedy captures and a lookahead that can backtrack across the
+# whole document.
+
+# Stage 1: the anchored prefix, from the document type up to the date,
+# e.g. "Décret exécutif n° 24-402 du".
+HEADER_PREFIX_PATTERN = re.compile(
     r"""
-    ^                                     # Start of the string (or line in multiline mode)
+    ^                                     # Start of a line
     (?P<type>(?:Décret|Loi|Arrêté|Décision)[\s\wéèçà\-\.\/]+?)  # Document type (non-greedy)
     \s+n°\s*(?P<number>[\d\s\-\.\/]+?)      # Document number (non-greedy)
-    \s+du\s+(?P<date>.*?)                  # Date (non-greedy)
-    \s+(?:portant|relative\s+au|fixant|modifiant|mettant|portant)\s+ # Action verb for the title
-    (?P<title>.*?)                        # The rest of the title (non-greedy)
-    # Positive lookahead: Stop matching when we see the preamble or a list of articles
-    (?=
-        \n\s*Le\sPrésident\sde\sla\sRépublique,|
-        \n\s*Le\sPremier\sministre,|
-        \n\s*Vu\s+la\s+Constitution|
-        \n\s*Article\s*\d
+    \s+du(?=\s)                            # Followed by the date
+    """,
+    re.VERBOSE | re.IGNORECASE | re.MULTILINE,
+)
+
+# Stage 2: the date, up to the action verb that starts the title. Run within a
+# bounded window after the prefix (see HEADER_WINDOW in the parser).
+HEADER_DATE_PATTERN = re.compile(
+    r"""
+    \s+(?P<date>.*?)                      # Date (non-greedy)
+    \s+(?P<verb>portant|relative\s+au|fixant|modifiant|mettant) # Action verb for the title
+    \s+                                   # The title starts after the whitespace
+    """,
+    re.VERBOSE | re.DOTALL | re.IGNORECASE,
+)
+
+# Stage 3: the end of the title, where the preamble or the list of articles begins.
+HEADER_END_PATTERN = re.compile(
+    r"""
+    \n\s*+(?:
+        Le\sPrésident\sde\sla\sRépublique,|
+        Le\sPremier\sministre,|
+        Vu\s+la\s+Constitution|
+        Article\s*\d
     )
     """,
-    re.VERBOSE | re.DOTALL | re.IGNORECASE | re.MULTILINE,
+    re.VERBOSE | re.IGNORECASE,
 )
 
 # A simpler pattern for individual decisions which often lack a detailed title.
@@ -42,23 +76,30 @@ INDIVIDUAL_DECISION_PATTERN = re.compile(
 )
 
 
-# This pattern captures individual articles within a document.
-ARTICLE_PATTERN = re.compile(
+# Articles are tokenized line by line (see _iter_articles in the parser).
+# Both patterns are matched at the start of a line, leading whitespace included.
+
+# The line that opens an article: "Art." or "Article." and its number, with an
+# optional dash after it. The rest of the line is the start of the content.
+ARTICLE_START_PATTERN = re.compile(
+    r"""
+    \s*+(?:Art|Article)\.\s*+ # The literal "Art." or "Article."
+    (?P<number>\w++)             # Article number (e.g., "1er", "2", "15bis")
+    \s*+[—\-]?+                 # Optional dash or em-dash after the number
+    """,
+    re.VERBOSE,
+)
+
+# A line that closes the current article: the next article, a closing
+# statement or the signature.
+ARTICLE_END_PATTERN = re.compile(
     r"""
-    \n\s* # Start on a new line with optional space
-    (?:Art|Article)\.\s* # The literal "Art." or "Article."
-    (?P<number>[\w\d]+(?:er)?)          # Article number (e.g., "1er", "2", "15bis")
-    \s*[—\-]?\s* # Optional dash or em-dash after the number
-    (?P<content>.*?)                    # The content of the article (non-greedy)
-    # Positive lookahead: Stop when we see the next article, a closing statement,
-    # or the end of the document.
-    (?=
-        \n\s*(?:Art|Article)\.|
-        \n\s*Fait\sà\sAlger|
-        \n\s*Le\sministre|
-        \n\s*Par\s+ces\s+motifs|
-        $
+    \s*+(?:
+        (?:Art|Article)\.|
+        Fait\sà\sAlger|
+        Le\sministre|
+        Par\s+ces\s+motifs
     )
     """,
-    re.VERBOSE | re.DOTALL,
+    re.VERBOSE,
 )
@@ -1,16 +1,23 @@
 # src/dz_scrap/rag/chunker.py
 
+from collections import ChainMap
 from typing import Dict, List, Iterator
 
 class DocumentChunker:
     """
     Splits structured legal documents into smaller text chunks suitable for RAG systems.
     """
+    # Bump whenever a change alters the chunks, to invalidate cached results
+    VERSION = "1"
+
     def chunk_document(self, document: Dict) -> Iterator[Dict]:
         """
         Yields text chunks from a single document's articles.
 
         Each chunk contains the text and metadata linking back to the source.
+        The metadata is a ChainMap layering the chunk's article number over a
+        base mapping shared by every chunk of the document, rather than a copy
+        of it; serialize it with e.g. json.dump(..., default=dict).
 
         Args:
             document (Dict): A single document from the structured JSON.
@@ -34,10 +41,7 @@ class DocumentChunker:
             chunk_text = f'{document.get("document_type")}: {document.get("title")}'
             chunk = {
                 "text": chunk_text,
-                "metadata": {
-                    **base_metadata,
-                    "source_article_number": "N/A",
-                }
+                "metadata": ChainMap({"source_article_number": "N/A"}, base_metadata)
             }
             yield chunk
         else:
@@ -51,9 +55,6 @@ class DocumentChunker:
 
                 chunk = {
                     "text": chunk_text,
-                    "metadata": {
-                        **base_metadata,
-                        "source_article_number": article_number,
-                    }
+                    "metadata": ChainMap({"source_article_number": article_number}, base_metadata)
                 }
                 yield chunk
@@ -1,27 +1,64 @@
 # src/dz-scrap/scraping/scraper.py
 
 import logging
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+class _RateLimiter:
+    """
+    Spaces out requests made from several threads so that, together, they
+    never exceed a given number of requests per second.
+    """
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        """Blocks until the calling thread may send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        time.sleep(slot - now)
+
 class JoradpScraper:
     """
     A scraper specifically designed to download PDF files from the
     Official Gazette of Algeria (joradp.dz).
     """
-    def __init__(self, base_url: str = "https://www.joradp.dz/FTP/JO-FRANCAIS/"):
+    def __init__(self, base_url: str = "https://www.joradp.dz/FTP/JO-FRANCAIS/", max_workers: int = 8, requests_per_second: float = 1.0):
+        """
+        Initializes the scraper.
+
+        Args:
+            base_url (str): The base URL of the French edition's PDF archive.
+            max_workers (int): The number of concurrent requests.
+            requests_per_second (float): The overall request rate cap, shared by all workers
+                                         and counting both the HEAD probes and the
+                                         downloads. The default matches the one
+                                         request per second of a sequential crawl.
+        """
         self.base_url = base_url
+        self.max_workers = max_workers
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
             "Referer": "https://www.joradp.dz/HAR/Index.htm"
         }
-        # Use a session object for connection pooling
+        # Use a session object for connection pooling, with a connection per worker
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Be a good citizen: cap the request rate across all workers
+        self.rate_limiter = _RateLimiter(requests_per_second)
 
     def _construct_pdf_url(self, year: int, issue_number: int) -> str:
         """Constructs the direct URL for a given year and issue number."""
@@ -45,16 +82,24 @@ class JoradpScraper:
             save_path.parent.mkdir(parents=True, exist_ok=True)
 
             logging.info(f"Requesting PDF from {url}...")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
-
-            # Check if the content is actually a PDF
-            if "application/pdf" not in response.headers.get("Content-Type", ""):
-                logging.warning(f"URL did not return a PDF: {url}. Content-Type: {response.headers.get('Content-Type')}")
-                return False
-
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
+            self.rate_limiter.wait()
+            # Stream the body so the PDF is written to disk as it arrives
+            # instead of being buffered in memory first
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
+
+                # Check if the content is actually a PDF
+                if "application/pdf" not in response.headers.get("Content-Type", ""):
+                    logging.warning(f"URL did not return a PDF: {url}. Content-Type: {response.headers.get('Content-Type')}")
+                    return False
+
+                # Write to a temporary file first, so an interrupted download
+                # is never mistaken for a complete one on the next run
+                part_path = save_path.with_suffix(".pdf.part")
+                with open(part_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+                part_path.replace(save_path)
 
             logging.info(f"Successfully downloaded and saved to {save_path}")
             return True
@@ -69,10 +114,55 @@ class JoradpScraper:
             logging.error(f"Failed to download {url}: {e}")
             return False
 
+    def _issue_exists(self, url: str) -> bool:
+        """
+        Checks with a HEAD request (lighter than GET) whether an issue exists.
+        Network errors count as existing, so the download gets a chance to report them.
+        """
+        try:
+            self.rate_limiter.wait()
+            response = self.session.head(url, timeout=30)
+            return response.status_code != 404
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Could not check {url}: {e}")
+            return True
+
+    def _find_issues_to_download(self, executor: ThreadPoolExecutor, year: int, issues_per_year: int, data_dir: Path) -> list[tuple[str, Path]]:
+        """
+        Probes the issues of a year concurrently, in batches of max_workers,
+        and returns the (url, save_path) pairs of those that exist and are not
+        downloaded yet.
+        """
+        to_download = []
+        for batch_start in range(1, issues_per_year + 1, self.max_workers):
+            batch = []
+            for issue in range(batch_start, min(batch_start + self.max_workers, issues_per_year + 1)):
+                file_name = f"F{year}{issue:03d}.pdf"
+                save_path = data_dir / str(year) / file_name
+                if save_path.exists():
+                    logging.info(f"File {save_path} already exists. Skipping.")
+                    continue
+                batch.append((issue, self._construct_pdf_url(year, issue), save_path))
+
+            exists = executor.map(self._issue_exists, [pdf_url for _, pdf_url, _ in batch])
+            for (issue, pdf_url, save_path), issue_exists in zip(batch, exists):
+                if issue_exists:
+                    to_download.append((pdf_url, save_path))
+                # If we get a 404, there's a good chance we've reached the last issue for the year
+                # We'll add a small tolerance before stopping
+                elif issue > 5: # A simple heuristic to avoid stopping too early
+                    logging.info(f"Assuming no more issues for year {year} after checking issue {issue}. Moving to next year.")
+                    return to_download
+        return to_download
+
     def scrape_by_range(self, start_year: int, end_year: int, issues_per_year: int = 100):
         """
         Scrapes PDFs for a given range of years and issues.
 
+        The issues of each year are first probed with concurrent HEAD requests,
+        then the existing ones are downloaded concurrently, all within the
+        scraper's request rate cap.
+
         Args:
             start_year (int): The first year in the range.
             end_year (int): The last year in the range.
@@ -84,26 +174,10 @@ class JoradpScraper:
         project_root = Path(__file__).resolve().parents[3]
         data_dir = project_root / "data"
 
-        for year in range(start_year, end_year + 1):
-            logging.info(f"--- Processing Year: {year} ---")
-            for issue in range(1, issues_per_year + 1):
-                pdf_url = self._construct_pdf_url(year, issue)
-                file_name = f"F{year}{issue:03d}.pdf"
-                save_path = data_dir / str(year) / file_name
-
-                if save_path.exists():
-                    logging.info(f"File {save_path} already exists. Skipping.")
-                    continue
-
-                if self.download_pdf(pdf_url, save_path):
-                    # Be a good citizen and wait a bit between requests
-                    time.sleep(1)
-                else:
-                    # If we get a 404, there's a good chance we've reached the last issue for the year
-                    # We'll add a small tolerance before breaking
-                    if issue > 5: # A simple heuristic to avoid stopping too early
-                        response = self.session.head(pdf_url) # HEAD request is lighter than GET
-                        if response.status_code == 404:
-                            logging.info(f"Assuming no more issues for year {year} after checking issue {issue}. Moving to next year.")
-                            break
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for year in range(start_year, end_year + 1):
+                logging.info(f"--- Processing Year: {year} ---")
+                to_download = self._find_issues_to_download(executor, year, issues_per_year, data_dir)
+                logging.info(f"Downloading {len(to_download)} issue(s) for year {year}...")
+                list(executor.map(lambda task: self.download_pdf(*task), to_download))
         logging.info("Scraping finished.")
@@ -0,0 +1,75 @@
+# tools/_common.py
+"""
+Paths and file helpers shared by the tool scripts.
+
+Importing this module also adds the 'src' directory to the Python path, so
+the dz_scrap package can be imported after it.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Each stage's outputs mirror the layout of the PDFs under DATA_DIR,
+# e.g. data/2024/F2024001.pdf -> data/processed_text/2024/F2024001.txt
+DATA_DIR = PROJECT_ROOT / "data"
+PROCESSED_TEXT_DIR = DATA_DIR / "processed_text"
+STRUCTURED_JSON_DIR = DATA_DIR / "structured_json"
+RAG_CHUNKS_DIR = DATA_DIR / "rag_chunks"
+
+# Outputs are read and written in one go through a 1 MiB buffer, as bytes,
+# rather than in many small writes through a text wrapper
+IO_BUFFER_SIZE = 1 << 20
+
+# Outputs named *.zst (see the pipeline's --compress) are zstd-compressed
+ZSTD_SUFFIX = ".zst"
+
+def pdf_to_txt_path(pdf_path: Path) -> Path:
+    """Returns the text file path of a PDF under DATA_DIR."""
+    return PROCESSED_TEXT_DIR / pdf_path.relative_to(DATA_DIR).with_suffix(".txt")
+
+def txt_to_json_path(txt_path: Path) -> Path:
+    """Returns the structured JSON file path of a text file under PROCESSED_TEXT_DIR."""
+    return STRUCTURED_JSON_DIR / txt_path.relative_to(PROCESSED_TEXT_DIR).with_suffix(".json")
+
+def json_to_chunks_path(json_path: Path) -> Path:
+    """Returns the chunk file path of a structured JSON file under STRUCTURED_JSON_DIR."""
+    return RAG_CHUNKS_DIR / json_path.relative_to(STRUCTURED_JSON_DIR).with_suffix(".chunks.json")
+
+def iter_pdfs(root: Path) -> Iterator[Path]:
+    """
+    Yields the PDF files under root, recursively.
+
+    os.scandir reads each directory once and reuses its entries' type
+    information, and only matching files are turned into Path objects.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_pdfs(Path(entry.path))
+            elif entry.name.endswith('.pdf'):
+                yield Path(entry.path)
+
+def write_output(path: Path, data: bytes):
+    """Writes an output file, zstd-compressing it if it is named *.zst."""
+    if path.suffix == ZSTD_SUFFIX:
+        import zstandard
+        # Level 1 shrinks the text several times over at close to copying speed
+        data = zstandard.ZstdCompressor(level=1).compress(data)
+    with open(path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(data)
+
+def read_output(path: Path) -> bytes:
+    """Reads an output file back, decompressing it if it is named *.zst."""
+    with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        data = f.read()
+    if path.suffix == ZSTD_SUFFIX:
+        import zstandard
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return data
@@ -0,0 +1,28 @@
+# tools/export_onnx_model.py
+
+import argparse
+
+# Adds the 'src' directory to the Python path
+import _common  # noqa: F401
+
+from dz_scrap.embedding.model_loader import DEFAULT_MODEL_DIR, DEFAULT_QUANTIZATION, export_quantized_model
+
+def main():
+    """Exports the embedding model to an int8-quantized ONNX model, once, offline."""
+    parser = argparse.ArgumentParser(description="Export the sentence-transformer model to a quantized ONNX model.")
+    parser.add_argument(
+        "--quantization",
+        default=DEFAULT_QUANTIZATION,
+        choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+        help="The instruction set to tune the int8 kernels for."
+    )
+    args = parser.parse_args()
+
+    if args.quantization != DEFAULT_QUANTIZATION:
+        print(f"Note: the API and ingestion script load the '{DEFAULT_QUANTIZATION}' model by default.")
+
+    onnx_path = export_quantized_model(DEFAULT_MODEL_DIR, args.quantization)
+    print(f"Quantized model saved to {onnx_path}")
+
+if __name__ == "__main__":
+    main()
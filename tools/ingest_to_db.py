@@ -1,62 +1,76 @@
 # tools/ingest_to_db.py
-import sys
-import json
+import orjson
 from pathlib import Path
-import numpy as np
-from sentence_transformers import SentenceTransformer
 
-script_dir = Path(__file__).resolve().parent
-project_root = script_dir.parent
-src_dir = project_root / "src"
-sys.path.insert(0, str(src_dir))
+# Also adds the 'src' directory to the Python path
+from _common import DATA_DIR, STRUCTURED_JSON_DIR, RAG_CHUNKS_DIR, ZSTD_SUFFIX, read_output
 
 from dz_scrap.database.db_manager import DBManager
+from dz_scrap.embedding.model_loader import load_embedding_model
+
+def find_outputs(root: Path, pattern: str) -> list[Path]:
+    """
+    Returns the pipeline outputs under root matching pattern, compressed (*.zst)
+    or not. A run with --compress after a plain one leaves both forms of a file;
+    only the plain one is kept, so its chunks are not ingested twice.
+    """
+    outputs = {path.with_name(path.name.removesuffix(ZSTD_SUFFIX)): path for path in root.glob(f"**/{pattern}{ZSTD_SUFFIX}")}
+    outputs.update((path, path) for path in root.glob(f"**/{pattern}"))
+    return sorted(outputs.values())
 
 def main():
     print("--- Starting Ingestion to Database ---")
-    data_dir = project_root / "data"
-    db_path = data_dir / "legal_data.db"
+    db_path = DATA_DIR / "legal_data.db"
     
     # Initialize database and embedding model
     db_manager = DBManager(db_path)
     print("Loading sentence-transformer model...")
-    model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+    model = load_embedding_model()
     print("Model loaded.")
     
-    json_files = sorted(list((data_dir / "structured_json").glob("**/*.json")))
-    chunk_files = sorted(list((data_dir / "rag_chunks").glob("**/*.chunks.json")))
+    # Compressed outputs are stored under the name of the file they decompress to
+    json_files = find_outputs(STRUCTURED_JSON_DIR, "*.json")
+    chunk_files = find_outputs(RAG_CHUNKS_DIR, "*.chunks.json")
 
     # Ingest full documents first
     for json_path in json_files:
-        if db_manager.get_document_by_filename(json_path.name):
-            print(f"Document {json_path.name} already in DB. Skipping.")
+        file_name = json_path.name.removesuffix(ZSTD_SUFFIX)
+        if db_manager.get_document_by_filename(file_name):
+            print(f"Document {file_name} already in DB. Skipping.")
             continue
-        print(f"Ingesting document: {json_path.name}")
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Use the category of the first document as representative
-            category = data[0].get('category', 'Uncategorized') if data else 'Uncategorized'
-            db_manager.insert_document(json_path.name, category, data)
+        print(f"Ingesting document: {file_name}")
+        data = orjson.loads(read_output(json_path))
+        # Use the category of the first document as representative
+        category = data[0].get('category', 'Uncategorized') if data else 'Uncategorized'
+        db_manager.insert_document(file_name, category, data)
             
-    # Ingest chunks and create embeddings
+    # Gather the chunks of every file so they are embedded in one batched pass
+    pending_chunks = []
     for chunk_path in chunk_files:
-        print(f"Processing chunks from: {chunk_path.name}")
-        doc_id = db_manager.get_document_by_filename(chunk_path.name.replace('.chunks.json', '.json'))
+        print(f"Collecting chunks from: {chunk_path.name}")
+        doc_id = db_manager.get_document_by_filename(chunk_path.name.removesuffix(ZSTD_SUFFIX).replace('.chunks.json', '.json'))
         if not doc_id:
             print(f"Warning: No parent document found in DB for {chunk_path.name}. Skipping.")
             continue
             
-        with open(chunk_path, 'r', encoding='utf-8') as f:
-            chunks = json.load(f)
-        
-        texts_to_embed = [chunk['text'] for chunk in chunks]
-        print(f"Creating {len(texts_to_embed)} embeddings...")
-        embeddings = model.encode(texts_to_embed, show_progress_bar=True)
-        
+        chunks = orjson.loads(read_output(chunk_path))
+        pending_chunks.extend((doc_id, chunk['text'], chunk['metadata']) for chunk in chunks)
+
+    if pending_chunks:
+        print(f"Creating {len(pending_chunks)} embeddings...")
+        embeddings = model.encode(
+            [text for _, text, _ in pending_chunks],
+            batch_size=64,
+            show_progress_bar=True,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
         print("Inserting chunks and embeddings into database...")
-        for i, chunk in enumerate(chunks):
-            embedding_bytes = embeddings[i].astype(np.float32).tobytes()
-            db_manager.insert_chunk(doc_id, chunk['text'], embedding_bytes, chunk['metadata'])
+        db_manager.insert_chunks(
+            (doc_id, text, embeddings[i], metadata)
+            for i, (doc_id, text, metadata) in enumerate(pending_chunks)
+        )
             
     print("--- Ingestion Complete ---")
 
@@ -1,16 +1,11 @@
 # tools/prepare_for_rag.py
 
-import sys
 import argparse
-from pathlib import Path
-import json
+import orjson
 import time
 
-# Add the 'src' directory to the Python path
-script_dir = Path(__file__).resolve().parent
-project_root = script_dir.parent
-src_dir = project_root / "src"
-sys.path.insert(0, str(src_dir))
+# Also adds the 'src' directory to the Python path
+from _common import STRUCTURED_JSON_DIR, RAG_CHUNKS_DIR, json_to_chunks_path
 
 from dz_scrap.rag.chunker import DocumentChunker
 
@@ -19,15 +14,12 @@ def main():
     parser = argparse.ArgumentParser(description="Chunk structured JSON files for RAG systems.")
     args = parser.parse_args()
 
-    data_dir = project_root / "data"
-    input_dir = data_dir / "structured_json"
-    output_dir = data_dir / "rag_chunks"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    RAG_CHUNKS_DIR.mkdir(parents=True, exist_ok=True)
 
-    json_files = sorted(list(input_dir.glob("**/*.json")))
+    json_files = sorted(list(STRUCTURED_JSON_DIR.glob("**/*.json")))
 
     if not json_files:
-        print(f"No structured JSON files found in '{input_dir}'. Run the parser first.")
+        print(f"No structured JSON files found in '{STRUCTURED_JSON_DIR}'. Run the parser first.")
         return
 
     print(f"Found {len(json_files)} JSON file(s) to process into chunks.")
@@ -40,8 +32,8 @@ def main():
         print("-" * 50)
         print(f"Chunking file {i + 1}/{len(json_files)}: {json_path.name}")
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            structured_data = json.load(f)
+        with open(json_path, 'rb') as f:
+            structured_data = orjson.loads(f.read())
 
         all_chunks = []
         for document in structured_data:
@@ -50,12 +42,12 @@ def main():
 
         if all_chunks:
             total_chunks += len(all_chunks)
-            relative_path = json_path.relative_to(input_dir)
-            chunk_output_path = (output_dir / relative_path).with_suffix(".chunks.json")
+            chunk_output_path = json_to_chunks_path(json_path)
             chunk_output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(chunk_output_path, 'w', encoding='utf-8') as f:
-                json.dump(all_chunks, f, ensure_ascii=False, indent=4)
+            # Chunk metadata is a ChainMap over the document's shared metadata; flatten it on write
+            with open(chunk_output_path, 'wb') as f:
+                f.write(orjson.dumps(all_chunks, default=dict, option=orjson.OPT_INDENT_2))
             
             print(f"Successfully created {len(all_chunks)} chunks.")
             print(f"Saved chunked JSON to {chunk_output_path}")
@@ -1,67 +1,153 @@
 # tools/run_full_pipeline.py
 
+from __future__ import annotations
+
+import os
 import sys
+import hashlib
 import argparse
 from pathlib import Path
 import time
-import json
+import orjson
 import logging
-from functools import partial
-from multiprocessing import Pool, cpu_count
+from collections import deque
+from typing import TYPE_CHECKING
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 # --- Setup ---
 # Configure logging for clear output
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
 
-# Add the 'src' directory to the Python path
-script_dir = Path(__file__).resolve().parent
-project_root = script_dir.parent
-src_dir = project_root / "src"
-sys.path.insert(0, str(src_dir))
-
-# Import all necessary processors from the application's modules
-from dz_scrap.scraping.scraper import JoradpScraper
-from dz_scrap.ocr.ocr_processor import OcrProcessor
-from dz_scrap.parsing.parser import LegalParser
-from dz_scrap.classification.classifier import DocumentClassifier
-from dz_scrap.rag.chunker import DocumentChunker
-
-
-# --- Encapsulated OCR Worker Function for Multiprocessing ---
-def ocr_worker(pdf_path: Path, data_dir: Path, force_rerun: bool) -> Path | None:
-    """A single unit of work for the OCR process, designed to be run in parallel."""
-    try:
-        ocr_processor = OcrProcessor(language='fra+ara')
-        relative_path = pdf_path.relative_to(data_dir)
-        txt_output_path = data_dir / "processed_text" / relative_path.with_suffix(".txt")
-        
-        if not force_rerun and txt_output_path.exists():
-            logging.info(f"Text file exists for {pdf_path.name}, skipping OCR.")
-            return txt_output_path
-        
-        logging.info(f"Performing OCR on {pdf_path.name}...")
-        txt_output_path.parent.mkdir(parents=True, exist_ok=True)
-        extracted_text = ocr_processor.process_pdf(pdf_path)
-        
-        if extracted_text:
-            with open(txt_output_path, 'w', encoding='utf-8') as f:
-                f.write(extracted_text)
-            logging.info(f"Successfully saved text to {txt_output_path.name}")
-            return txt_output_path
-        else:
-            logging.warning(f"Failed to extract text from {pdf_path.name}.")
-            return None
-    except Exception as e:
-        logging.error(f"Error processing {pdf_path.name} in a worker process: {e}")
+# Also adds the 'src' directory to the Python path
+from _common import (
+    DATA_DIR, ZSTD_SUFFIX, iter_pdfs, json_to_chunks_path, pdf_to_txt_path, read_output,
+    txt_to_json_path, write_output,
+)
+from dz_scrap.database.manifest import PipelineManifest, STAGE_PENDING, STAGE_OCR_DONE, STAGE_PARSED, STAGE_CHUNKED
+
+# The processors pull in the OCR, PDF and HTTP libraries: they are imported
+# by the steps and worker processes that use them, so that --help and the
+# skipped steps don't pay for those imports
+if TYPE_CHECKING:
+    from diskcache import Cache
+    from dz_scrap.ocr.ocr_processor import OcrProcessor
+    from dz_scrap.parsing.parser import LegalParser
+    from dz_scrap.classification.classifier import DocumentClassifier
+    from dz_scrap.rag.chunker import DocumentChunker
+
+
+# The default OCR resolution, the OcrProcessor's own (kept here so that the
+# OCR libraries are not imported just to build the CLI)
+DEFAULT_OCR_DPI = 200
+
+# Workers are replaced after this many tasks, returning whatever memory page
+# images and Tesseract have left behind to the system. Tasks are mostly single
+# pages being OCR'd, each holding one page image at a time, so this bounds a
+# worker's lifetime to about 64 pages (one or two gazettes) while a restart,
+# about a second, stays well under 1% of the OCR time of those pages.
+TASKS_PER_WORKER = 64
+
+# --- Shared Worker Pool ---
+# Each worker process builds its processors once, in _init_worker, and keeps
+# them for every task it runs
+_OCR: OcrProcessor | None = None
+_PARSER: LegalParser | None = None
+_CLASSIFIER: DocumentClassifier | None = None
+_CHUNKER: DocumentChunker | None = None
+# Parser and chunker outputs, keyed by a hash of their input and the code version
+_PARSE_CACHE: Cache | None = None
+_CHUNK_CACHE: Cache | None = None
+
+def _init_worker(language: str, ocr_threads: int, ocr_dpi: int, ocr_max_dim: int | None, cache_dir: Path | None):
+    """Sets up a pipeline worker process. Caching is off if cache_dir is None."""
+    global _OCR, _PARSER, _CLASSIFIER, _CHUNKER, _PARSE_CACHE, _CHUNK_CACHE
+    # Cap Tesseract's OpenMP threads, and keep BLAS single-threaded, before the
+    # OCR libraries load: the pool already spreads the work across the cores
+    os.environ["OMP_THREAD_LIMIT"] = str(ocr_threads)
+    os.environ["OPENBLAS_NUM_THREADS"] = "1"
+    from diskcache import Cache
+    from dz_scrap.ocr.ocr_processor import OcrProcessor
+    from dz_scrap.parsing.parser import LegalParser
+    from dz_scrap.classification.classifier import DocumentClassifier
+    from dz_scrap.rag.chunker import DocumentChunker
+
+    # The pool is the parallelism: OCR a PDF's pages and parse a gazette's documents in-process
+    _OCR = OcrProcessor(language=language, max_workers=1, dpi=ocr_dpi, max_image_dim=ocr_max_dim)
+    _PARSER = LegalParser(max_workers=1)
+    _CLASSIFIER = DocumentClassifier()
+    _CHUNKER = DocumentChunker()
+    if cache_dir is not None:
+        _PARSE_CACHE = Cache(cache_dir / "parse")
+        _CHUNK_CACHE = Cache(cache_dir / "chunk")
+
+class PipelineContext:
+    """
+    Owns the process pool shared by every stage of the pipeline, so that workers
+    are started, and their processors built, once per run rather than per stage.
+    """
+    def __init__(self, max_workers: int, ocr_threads: int = 1, language: str = 'fra+ara',
+                 ocr_dpi: int = DEFAULT_OCR_DPI, ocr_max_dim: int | None = None, cache_dir: Path | None = None):
+        """
+        Args:
+            max_workers (int): The number of worker processes.
+            ocr_threads (int): The number of threads each worker's Tesseract may use.
+            language (str): The language string for Tesseract.
+            ocr_dpi (int): The resolution pages are rasterized at for OCR.
+            ocr_max_dim (int | None): The longest side page images are downsized to, None to keep them whole.
+            cache_dir (Path | None): Where parser and chunker outputs are cached, None to disable caching.
+        """
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(language, ocr_threads, ocr_dpi, ocr_max_dim, cache_dir),
+            max_tasks_per_child=TASKS_PER_WORKER,
+        )
+
+    def __enter__(self) -> "PipelineContext":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.executor.shutdown(wait=True)
+
+# --- OCR Worker Functions ---
+# A PDF is OCR'd in page-level tasks, so that a long gazette is spread across
+# all the workers instead of keeping one busy long after the others are done
+
+def text_layer_worker(pdf_path: Path, txt_output_path: Path, force_rerun: bool) -> list[str | None] | None:
+    """
+    Reads the text layer of a PDF's pages; those without one are left as None
+    for OCR. Returns None if the PDF's text file already exists.
+    """
+    if not force_rerun and txt_output_path.exists():
+        logging.info(f"Text file exists for {pdf_path.name}, skipping OCR.")
+        return None
+    logging.info(f"Performing OCR on {pdf_path.name}...")
+    return _OCR.read_text_layer(pdf_path)
+
+def ocr_page_worker(pdf_path: Path, page_num: int, page_count: int) -> str:
+    """OCRs a single page of a PDF."""
+    return _OCR.ocr_page(pdf_path, page_num, page_count)
+
+def save_text_worker(pdf_path: Path, txt_output_path: Path, page_texts: list[str]) -> Path | None:
+    """Joins the texts of a PDF's pages and saves them to its text file."""
+    extracted_text = _OCR.join_pages(page_texts)
+    if not extracted_text:
+        logging.warning(f"Failed to extract text from {pdf_path.name}.")
         return None
+    txt_output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_output(txt_output_path, extracted_text.encode('utf-8'))
+    logging.info(f"Successfully saved text to {txt_output_path.name}")
+    return txt_output_path
 
 # --- Pipeline Step Functions ---
 
-def run_scraping(start_year: int, end_year: int, issues_per_year: int, data_dir: Path) -> list[Path]:
+def run_scraping(start_year: int, end_year: int, issues_per_year: int) -> list[Path]:
     """
     Runs the scraping process and returns a list of downloaded PDF paths.
     """
     logging.info("--- STEP 1: Starting Scraping Process ---")
+    from dz_scrap.scraping.scraper import JoradpScraper
     scraper = JoradpScraper()
     # Modify the scraper to return the paths of the files it downloads
     # For now, we'll scrape and then find the files. A future improvement
@@ -71,83 +157,181 @@ def run_scraping(start_year: int, end_year: int, issues_per_year: int, data_dir:
     # Return all PDF files within the specified year range
     all_pdfs = []
     for year in range(start_year, end_year + 1):
-        year_dir = data_dir / str(year)
+        year_dir = DATA_DIR / str(year)
         if year_dir.exists():
-            all_pdfs.extend(list(year_dir.glob("*.pdf")))
+            all_pdfs.extend(iter_pdfs(year_dir))
     logging.info(f"Scraping complete. Found {len(all_pdfs)} PDFs in the target year range.")
     return sorted(all_pdfs)
     
-def run_ocr(pdf_paths: list[Path], data_dir: Path, force_rerun: bool) -> list[Path]:
+def output_paths(pdf_path: Path, compress: bool = False) -> tuple[Path, Path, Path]:
     """
-    Runs OCR on a list of PDFs and returns a list of generated text file paths.
+    Returns the text, structured JSON and chunk file paths generated for a PDF,
+    e.g. data/processed_text/2024/F2024001.txt for data/2024/F2024001.pdf.
+    With compress, each is suffixed with .zst (e.g. F2024001.txt.zst).
     """
-    logging.info(f"--- STEP 2: Starting OCR Process on {len(pdf_paths)} files ---")
-    ocr_processor = OcrProcessor(language='fra+ara')
-    txt_output_paths = []
-    
-    for pdf_path in pdf_paths:
-        relative_path = pdf_path.relative_to(data_dir)
-        txt_output_path = data_dir / "processed_text" / relative_path.with_suffix(".txt")
-        txt_output_paths.append(txt_output_path)
-        
-        if not force_rerun and txt_output_path.exists():
-            logging.info(f"Text file exists for {pdf_path.name}, skipping OCR.")
-            continue
-        
-        logging.info(f"Performing OCR on {pdf_path.name}...")
-        txt_output_path.parent.mkdir(parents=True, exist_ok=True)
-        extracted_text = ocr_processor.process_pdf(pdf_path)
-        
-        if extracted_text:
-            with open(txt_output_path, 'w', encoding='utf-8') as f:
-                f.write(extracted_text)
-            logging.info(f"Successfully saved text to {txt_output_path.name}")
-        else:
-            logging.warning(f"Failed to extract text from {pdf_path.name}.")
-            
-    return txt_output_paths
+    txt_path = pdf_to_txt_path(pdf_path)
+    json_path = txt_to_json_path(txt_path)
+    chunks_path = json_to_chunks_path(json_path)
+    if not compress:
+        return txt_path, json_path, chunks_path
+    return tuple(path.with_name(path.name + ZSTD_SUFFIX) for path in (txt_path, json_path, chunks_path))
 
-def run_parsing(txt_paths: list[Path], data_dir: Path, force_rerun: bool) -> list[Path]:
-    """
-    Parses a list of text files and returns a list of generated JSON file paths.
-    """
-    logging.info(f"--- STEP 3: Starting Parsing & Classification on {len(txt_paths)} files ---")
-    legal_parser = LegalParser()
-    classifier = DocumentClassifier()
-    json_output_paths = []
-    for txt_path in txt_paths:
-        if not txt_path.exists(): continue
-        relative_path = txt_path.relative_to(data_dir / "processed_text")
-        json_output_path = data_dir / "structured_json" / relative_path.with_suffix(".json")
-        json_output_paths.append(json_output_path)
-        if not force_rerun and json_output_path.exists(): continue
-        with open(txt_path, 'r', encoding='utf-8') as f: raw_text = f.read()
-        structured_data = legal_parser.process_full_gazette(raw_text)
-        if structured_data:
-            for doc in structured_data: doc['category'] = classifier.classify(doc)
-            json_output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(json_output_path, 'w', encoding='utf-8') as f: json.dump(structured_data, f, ensure_ascii=False, indent=4)
-    return json_output_paths
-
-def run_rag_prep(json_paths: list[Path], data_dir: Path, force_rerun: bool) -> list[Path]:
+def _content_key(content: bytes, version: str) -> str:
+    """Returns the cache key for an input's content and the version of the code processing it."""
+    return f"{hashlib.blake2b(content, digest_size=16).hexdigest()}-{version}"
+
+def parse_worker(txt_path: Path, json_output_path: Path, force_rerun: bool) -> Path | None:
+    """Parses and classifies a single text file into structured JSON."""
+    if not force_rerun and json_output_path.exists():
+        return json_output_path
+    text_bytes = read_output(txt_path)
+    cache_key = _content_key(text_bytes, _PARSER.VERSION)
+    structured_data = _PARSE_CACHE.get(cache_key) if _PARSE_CACHE is not None else None
+    if structured_data is None:
+        structured_data = _PARSER.process_full_gazette(text_bytes.decode('utf-8'))
+        if _PARSE_CACHE is not None:
+            _PARSE_CACHE.set(cache_key, structured_data)
+    if not structured_data:
+        return None
+    for doc in structured_data: doc['category'] = _CLASSIFIER.classify(doc)
+    json_output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_output(json_output_path, orjson.dumps(structured_data, option=orjson.OPT_INDENT_2))
+    return json_output_path
+
+def rag_prep_worker(json_path: Path, chunk_output_path: Path, force_rerun: bool) -> Path | None:
+    """Chunks a single structured JSON file for RAG."""
+    if not force_rerun and chunk_output_path.exists():
+        return chunk_output_path
+    json_bytes = read_output(json_path)
+    cache_key = _content_key(json_bytes, _CHUNKER.VERSION)
+    all_chunks = _CHUNK_CACHE.get(cache_key) if _CHUNK_CACHE is not None else None
+    if all_chunks is None:
+        structured_data = orjson.loads(json_bytes)
+        all_chunks = [chunk for document in structured_data for chunk in _CHUNKER.chunk_document(document)]
+        if _CHUNK_CACHE is not None:
+            _CHUNK_CACHE.set(cache_key, all_chunks)
+    if not all_chunks:
+        return None
+    chunk_output_path.parent.mkdir(parents=True, exist_ok=True)
+    # default=dict flattens the chunks' ChainMap metadata
+    write_output(chunk_output_path, orjson.dumps(all_chunks, default=dict, option=orjson.OPT_INDENT_2))
+    return chunk_output_path
+
+def run_processing(context: PipelineContext, pdf_paths: list[Path], force_rerun: bool,
+                   manifest: PipelineManifest, resume: bool = False, compress: bool = False) -> list[Path]:
     """
-    Chunks structured JSON files and returns a list of generated chunk file paths.
+    Runs OCR, parsing and RAG preparation on a list of PDFs and returns the
+    generated chunk file paths.
+
+    Every file moves through the stages on its own: a single driver loop submits
+    each file's next task as soon as its previous one finishes, so parsing and
+    chunking run while other PDFs are still being OCR'd. OCR itself is split
+    into one task per page without a text layer.
+
+    Each PDF's progress is recorded in the manifest, along with whether its
+    outputs are compressed. With resume, the stages it has already completed
+    in the same form are skipped without checking their outputs.
+
+    With compress, the outputs are written zstd-compressed, as *.zst files.
     """
-    logging.info(f"--- STEP 4: Starting RAG Preparation on {len(json_paths)} files ---")
-    chunker = DocumentChunker()
-    chunk_output_paths = []
-    for json_path in json_paths:
-        if not json_path.exists(): continue
-        relative_path = json_path.relative_to(data_dir / "structured_json")
-        chunk_output_path = data_dir / "rag_chunks" / relative_path.with_suffix(".chunks.json")
-        chunk_output_paths.append(chunk_output_path)
-        if not force_rerun and chunk_output_path.exists(): continue
-        with open(json_path, 'r', encoding='utf-8') as f: structured_data = json.load(f)
-        all_chunks = [chunk for document in structured_data for chunk in chunker.chunk_document(document)]
-        if all_chunks:
-            chunk_output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(chunk_output_path, 'w', encoding='utf-8') as f: json.dump(all_chunks, f, ensure_ascii=False, indent=4)
-    return chunk_output_paths
+    logging.info(f"--- STEP 2: Starting OCR, Parsing & RAG Preparation on {len(pdf_paths)} files ---")
+    executor = context.executor
+    # Every pending task, with its kind, the file's manifest key, its paths
+    # (PDF, text, structured JSON, chunks) and, for OCR, the page number
+    futures = {}
+    # The page texts of the PDFs being OCR'd, None until a page is done
+    page_texts = {}
+    # PDFs and pages waiting for a slot in the pool
+    pdf_queue = deque()
+    page_queue = deque()
+    chunk_paths = []
+
+    def submit(task: str, key: str, paths: tuple[Path, Path, Path, Path], page_num: int | None, worker, *args):
+        futures[executor.submit(worker, *args)] = (task, key, paths, page_num)
+
+    def ocr_done(key: str, paths: tuple[Path, Path, Path, Path]):
+        manifest.set_stage(key, STAGE_OCR_DONE, compress)
+        submit("parse", key, paths, None, parse_worker, paths[1], paths[2], force_rerun)
+
+    def save_text(key: str, paths: tuple[Path, Path, Path, Path], texts: list[str]):
+        submit("save", key, paths, None, save_text_worker, paths[0], paths[1], texts)
+
+    # Every output path is worked out once, up front
+    keys = [pdf_path.relative_to(DATA_DIR).as_posix() for pdf_path in pdf_paths]
+    file_paths = [(pdf_path, *output_paths(pdf_path, compress)) for pdf_path in pdf_paths]
+    stages = manifest.get_stages(keys, compress)
+    for key, paths in zip(keys, file_paths):
+        stage = stages[key] if resume and not force_rerun else STAGE_PENDING
+        if stage == STAGE_CHUNKED:
+            chunk_paths.append(paths[3])
+        elif stage == STAGE_PARSED:
+            submit("chunk", key, paths, None, rag_prep_worker, paths[2], paths[3], force_rerun)
+        elif stage == STAGE_OCR_DONE:
+            submit("parse", key, paths, None, parse_worker, paths[1], paths[2], force_rerun)
+        else:
+            pdf_queue.append((key, paths))
+
+    # Bound the queued OCR work (and the memory it holds) to twice the pool
+    # size, finishing the PDFs already started before opening new ones
+    max_ocr_tasks = 2 * context.max_workers
+    ocr_tasks = 0
+    while futures or pdf_queue or page_queue:
+        while ocr_tasks < max_ocr_tasks and (page_queue or pdf_queue):
+            if page_queue:
+                key, paths, page_num, page_count = page_queue.popleft()
+                # Another page of this PDF failed: its text will not be saved
+                if key not in page_texts:
+                    continue
+                submit("page", key, paths, page_num, ocr_page_worker, paths[0], page_num, page_count)
+            else:
+                key, paths = pdf_queue.popleft()
+                submit("layer", key, paths, None, text_layer_worker, paths[0], paths[1], force_rerun)
+            ocr_tasks += 1
+
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            task, key, paths, page_num = futures.pop(future)
+            if task in ("layer", "page"):
+                ocr_tasks -= 1
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Error processing {key}: {e}")
+                # Drop the PDF's other pages: those still queued are skipped,
+                # and whatever the running ones produce is ignored
+                page_texts.pop(key, None)
+                continue
+
+            if task == "layer":
+                if result is None:
+                    ocr_done(key, paths)
+                elif None in result:
+                    page_texts[key] = result
+                    page_queue.extend(
+                        (key, paths, page_num, len(result))
+                        for page_num, text in enumerate(result, start=1) if text is None
+                    )
+                else:
+                    save_text(key, paths, result)
+            elif task == "page":
+                texts = page_texts.get(key)
+                if texts is None:
+                    continue
+                texts[page_num - 1] = result
+                if None not in texts:
+                    del page_texts[key]
+                    save_text(key, paths, texts)
+            elif not result:
+                continue
+            elif task == "save":
+                ocr_done(key, paths)
+            elif task == "parse":
+                manifest.set_stage(key, STAGE_PARSED, compress)
+                submit("chunk", key, paths, None, rag_prep_worker, paths[2], paths[3], force_rerun)
+            else:
+                manifest.set_stage(key, STAGE_CHUNKED, compress)
+                chunk_paths.append(result)
+    return sorted(chunk_paths)
 
 # --- Main Orchestrator ---
 
@@ -160,24 +344,30 @@ def main():
     parser.add_argument("--limit", type=int, default=0, help="Limit the number of files to process in each step (0 for no limit).")
     parser.add_argument("--skip-scraping", action="store_true", help="Skip the scraping step and use existing PDFs.")
     parser.add_argument("--force-rerun", action="store_true", help="Force re-processing of files even if output already exists.")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the parser and chunker output cache.")
+    parser.add_argument("--ocr-workers", type=int, default=0, help="Number of worker processes (0 for the CPU count divided by --ocr-threads-per-worker).")
+    parser.add_argument("--ocr-threads-per-worker", type=int, default=1, help="Number of threads each worker's Tesseract may use.")
+    parser.add_argument("--ocr-dpi", type=int, default=DEFAULT_OCR_DPI, help=f"Resolution pages are rasterized at for OCR (default {DEFAULT_OCR_DPI}); raise it for low-quality scans.")
+    parser.add_argument("--ocr-max-dim", type=int, default=0, help="Downsize page images so their longest side is at most this many pixels before OCR (0 to keep them whole).")
+    parser.add_argument("--compress", action="store_true", help="Write the text, structured JSON and chunk files zstd-compressed (*.zst).")
+    parser.add_argument("--resume", action="store_true", help="Skip the stages each file completed in previous runs, as recorded in data/pipeline.db.")
     
     args = parser.parse_args()
     
     pipeline_start_time = time.time()
-    data_dir = project_root / "data"
     
     # --- Step 1: Scraping ---
     if not args.skip_scraping:
-        run_scraping(args.start_year, args.end_year, args.issues_per_year, data_dir)
+        run_scraping(args.start_year, args.end_year, args.issues_per_year)
     else:
         logging.info("--- SKIPPING SCRAPING STEP ---")
 
     # --- Prepare list of files to process ---
     all_pdfs = []
     for year in range(args.start_year, args.end_year + 1):
-        year_dir = data_dir / str(year)
+        year_dir = DATA_DIR / str(year)
         if year_dir.exists():
-            all_pdfs.extend(list(year_dir.glob("*.pdf")))
+            all_pdfs.extend(iter_pdfs(year_dir))
     
     if not all_pdfs:
         logging.error("No PDFs found to process. Please run the scraper first or check the data directory.")
@@ -189,9 +379,17 @@ def main():
         logging.info(f"Processing a limit of {args.limit} files.")
 
     # --- Execute subsequent pipeline steps ---
-    txt_files = run_ocr(files_to_process, data_dir, args.force_rerun)
-    json_files = run_parsing(txt_files, data_dir, args.force_rerun)
-    run_rag_prep(json_files, data_dir, args.force_rerun)
+    # Parser and chunker outputs are cached under data/.cache by input content, so
+    # unchanged inputs are not processed again even with --force-rerun
+    cache_dir = None if args.no_cache else DATA_DIR / ".cache"
+    manifest = PipelineManifest(DATA_DIR / "pipeline.db")
+    # Workers times Tesseract threads should not exceed the cores, or they thrash
+    ocr_threads = max(1, args.ocr_threads_per_worker)
+    ocr_workers = args.ocr_workers or max(1, (os.cpu_count() or 1) // ocr_threads)
+    logging.info(f"Using {ocr_workers} worker processes with {ocr_threads} Tesseract thread(s) each.")
+    with PipelineContext(ocr_workers, ocr_threads=ocr_threads, ocr_dpi=args.ocr_dpi,
+                         ocr_max_dim=args.ocr_max_dim or None, cache_dir=cache_dir) as context:
+        run_processing(context, files_to_process, args.force_rerun, manifest, resume=args.resume, compress=args.compress)
     
     pipeline_end_time = time.time()
     logging.info(f"--- FULL PIPELINE COMPLETED in {pipeline_end_time - pipeline_start_time:.2f} seconds ---")
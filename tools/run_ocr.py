@@ -1,15 +1,11 @@
 # tools/run_ocr.py
 
-import sys
 import argparse
-from pathlib import Path
 import time
+from itertools import islice
 
-# Add the 'src' directory to the Python path
-script_dir = Path(__file__).resolve().parent
-project_root = script_dir.parent
-src_dir = project_root / "src"
-sys.path.insert(0, str(src_dir))
+# Also adds the 'src' directory to the Python path
+from _common import DATA_DIR, PROCESSED_TEXT_DIR, IO_BUFFER_SIZE, iter_pdfs, pdf_to_txt_path
 
 from dz_scrap.ocr.ocr_processor import OcrProcessor
 
@@ -24,21 +20,16 @@ def main():
     )
     args = parser.parse_args()
 
-    data_dir = project_root / "data"
-    output_dir = data_dir / "processed_text"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    PROCESSED_TEXT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Find all PDF files in the data directory and its subdirectories
-    pdf_files = list(data_dir.glob("**/*.pdf"))
+    # Find the PDF files in the data directory and its subdirectories,
+    # stopping at the limit if one is specified
+    pdf_files = list(islice(iter_pdfs(DATA_DIR), args.limit or None))
 
     if not pdf_files:
         print("No PDF files found in the 'data' directory. Run the scraper first.")
         return
 
-    # Apply limit if specified
-    if args.limit > 0:
-        pdf_files = pdf_files[:args.limit]
-
     print(f"Found {len(pdf_files)} PDF(s) to process.")
 
     ocr_processor = OcrProcessor(language='fra+ara')
@@ -50,8 +41,7 @@ def main():
 
         # Define the output path for the .txt file
         # It will mirror the directory structure, e.g., data/processed_text/2024/F2024001.txt
-        relative_path = pdf_path.relative_to(data_dir)
-        txt_output_path = (output_dir / relative_path).with_suffix(".txt")
+        txt_output_path = pdf_to_txt_path(pdf_path)
 
         if txt_output_path.exists():
             print(f"Output file already exists at {txt_output_path}. Skipping.")
@@ -64,8 +54,9 @@ def main():
 
         if extracted_text:
             # Save the extracted text
-            with open(txt_output_path, 'w', encoding='utf-8') as f:
-                f.write(extracted_text)
+            # Written as bytes in one go, through a 1 MiB buffer
+            with open(txt_output_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.write(extracted_text.encode('utf-8'))
             print(f"Successfully saved extracted text to {txt_output_path}")
         else:
             print(f"Failed to extract text from {pdf_path.name}.")
@@ -1,16 +1,11 @@
 # tools/run_parser.py
 
-import sys
 import argparse
-from pathlib import Path
 import json
 import time
 
-# Add the 'src' directory to the Python path
-script_dir = Path(__file__).resolve().parent
-project_root = script_dir.parent
-src_dir = project_root / "src"
-sys.path.insert(0, str(src_dir))
+# Also adds the 'src' directory to the Python path
+from _common import PROCESSED_TEXT_DIR, STRUCTURED_JSON_DIR, txt_to_json_path
 
 from dz_scrap.parsing.parser import LegalParser
 from dz_scrap.classification.classifier import DocumentClassifier # Add this import
@@ -24,17 +19,20 @@ def main():
         default=0,
         help="Limit the number of text files to process (0 for no limit). Useful for testing."
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes parsing the documents of each gazette (default 1, in-process)."
+    )
     args = parser.parse_args()
 
-    data_dir = project_root / "data"
-    input_dir = data_dir / "processed_text"
-    output_dir = data_dir / "structured_json"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    STRUCTURED_JSON_DIR.mkdir(parents=True, exist_ok=True)
 
-    text_files = sorted(list(input_dir.glob("**/*.txt")))
+    text_files = sorted(list(PROCESSED_TEXT_DIR.glob("**/*.txt")))
 
     if not text_files:
-        print(f"No text files found in '{input_dir}'. Run the OCR script first.")
+        print(f"No text files found in '{PROCESSED_TEXT_DIR}'. Run the OCR script first.")
         return
 
     if args.limit > 0:
@@ -42,7 +40,7 @@ def main():
 
     print(f"Found {len(text_files)} text file(s) to parse.")
 
-    legal_parser = LegalParser()
+    legal_parser = LegalParser(max_workers=args.workers)
     classifier = DocumentClassifier()
     start_time = time.time()
 
@@ -60,8 +58,7 @@ def main():
             for doc in structured_data:
                 doc['category'] = classifier.classify(doc)
   
-            relative_path = txt_path.relative_to(input_dir)
-            json_output_path = (output_dir / relative_path).with_suffix(".json")
+            json_output_path = txt_to_json_path(txt_path)
             json_output_path.parent.mkdir(parents=True, exist_ok=True)
 
             with open(json_output_path, 'w', encoding='utf-8') as f:
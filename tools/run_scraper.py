@@ -1,15 +1,9 @@
 # tools/run_scraper.py
 
-import sys
-from pathlib import Path
 import argparse
 
 # This ensures that the script can find the 'dz-scrap' module in the 'src' directory
-
-script_dir = Path(__file__).resolve().parent  # This is the 'tools' directory
-project_root = script_dir.parent  # This is your 'dz-scrap-api' directory
-src_dir = project_root / "src"
-sys.path.insert(0, str(src_dir))
+import _common  # noqa: F401
 
 from dz_scrap.scraping.scraper import JoradpScraper
 